@@ -1,28 +1,74 @@
 """Base class for all data quality check scripts."""
 from abc import ABC, abstractmethod
-import mysql.connector
 from mysql.connector import Error
-from config import DatabaseConfig
+from config import CheckConfig, DatabaseConfig
 from issue import IssueCollection
 
 
 class BaseCheck(ABC):
     """Abstract base class for all data quality checks."""
-    
+
+    #: Which database this check queries ('magento' or 'erp'); used by the
+    #: runner to share one live connection per database across a batch
+    database = 'magento'
+
+    #: (table, index name, column list) advisories for this check's queries.
+    #: Applied by ensure_indexes when ENSURE_INDEXES is enabled; otherwise
+    #: they serve as documentation of the indexes the check benefits from
+    RECOMMENDED_INDEXES = []
+
     def __init__(self):
         self.check_name = self.__class__.__name__
         self.magento_config = DatabaseConfig.get_magento_config()
         self.erp_config = DatabaseConfig.get_erp_config()
+        # Cap on example rows reported per issue; summary counts stay exact
+        self.max_records = CheckConfig.get_detail_row_limit()
+        # Prepared cursors cached per statement for the duration of one
+        # run(); the check's finally closes them via close_prepared_cursors
+        self._prepared_cursors = {}
     
     @abstractmethod
-    def run(self) -> IssueCollection:
+    def run(self, connection=None) -> IssueCollection:
         """
         Execute the check and return an IssueCollection.
-        
+
+        Args:
+            connection: Optional injected database connection. When given,
+                the check uses it and leaves it open for the caller; when
+                omitted, the check acquires and releases its own pooled
+                connection.
+
         Returns:
             IssueCollection: Collection of issues found. Returns empty IssueCollection if no issues found.
         """
         pass
+
+    def iter_issues(self, connection=None):
+        """
+        Run the check and iterate over the issues it found.
+
+        Callers that only consume issues one at a time (e.g. streaming them
+        into a shared collection) can use this instead of holding the whole
+        IssueCollection.
+
+        Args:
+            connection: Optional injected database connection (see run())
+
+        Returns:
+            Iterator over Issue objects
+        """
+        return iter(self.run(connection))
+
+    def get_connection(self):
+        """
+        Get a pooled connection for this check's database.
+
+        Returns:
+            mysql.connector.pooling.PooledMySQLConnection: Database connection object
+        """
+        if self.database == 'erp':
+            return self.get_erp_connection()
+        return self.get_magento_connection()
     
     def create_issue_collection(self) -> IssueCollection:
         """
@@ -35,56 +81,195 @@ class BaseCheck(ABC):
     
     def get_magento_connection(self):
         """
-        Get a connection to the Magento database.
-        
+        Get a connection to the Magento database from the shared pool.
+
+        Closing the connection returns it to the pool instead of dropping it,
+        so checks can keep using their existing try/finally close pattern.
+
         Returns:
-            mysql.connector.connection.MySQLConnection: Database connection object
-            
+            mysql.connector.pooling.PooledMySQLConnection: Database connection object
+
         Raises:
             Error: If connection fails
         """
         try:
-            connection = mysql.connector.connect(**self.magento_config)
+            connection = DatabaseConfig.get_magento_pool().get_connection()
             return connection
         except Error as e:
             raise Error(f"Failed to connect to Magento database: {e}")
-    
+
     def get_erp_connection(self):
         """
-        Get a connection to the ERP database.
-        
+        Get a connection to the ERP database from the shared pool.
+
+        Closing the connection returns it to the pool instead of dropping it,
+        so checks can keep using their existing try/finally close pattern.
+
         Returns:
-            mysql.connector.connection.MySQLConnection: Database connection object
-            
+            mysql.connector.pooling.PooledMySQLConnection: Database connection object
+
         Raises:
             Error: If connection fails
         """
         try:
-            connection = mysql.connector.connect(**self.erp_config)
+            connection = DatabaseConfig.get_erp_pool().get_connection()
             return connection
         except Error as e:
             raise Error(f"Failed to connect to ERP database: {e}")
     
-    def execute_query(self, connection, query, params=None):
+    def execute_query(self, connection, query, params=None, stream=False,
+                      dictionary=False, prepared=False):
         """
         Execute a SQL query and return results.
-        
+
         Args:
             connection: MySQL connection object
             query: SQL query string
             params: Optional parameters for parameterized queries
-            
+            stream: If True, return a row iterator backed by an unbuffered
+                cursor instead of materializing the full result list. Rows
+                can then be processed as they arrive from the server, which
+                keeps memory flat for large result sets.
+            dictionary: If True, return rows as dicts keyed by column name
+                instead of tuples
+            prepared: If True, execute through a prepared cursor cached per
+                (connection, statement) pair. MySQL's binary protocol then
+                skips SQL reparsing when the same statement is re-run, which
+                pays off for checks executed on a repeating schedule.
+
         Returns:
-            list: List of tuples containing query results
+            list or iterator: List of result rows, or a row iterator when
+                stream=True (the cursor is closed once exhausted)
         """
-        cursor = connection.cursor()
+        if prepared and not stream:
+            return self._execute_prepared(connection, query, params)
+
+        cursor = connection.cursor(buffered=False, dictionary=dictionary)
         try:
             if params:
                 cursor.execute(query, params)
             else:
                 cursor.execute(query)
+        except Exception:
+            cursor.close()
+            raise
+
+        if stream:
+            return self._iter_rows(cursor)
+
+        try:
             results = cursor.fetchall()
             return results
         finally:
             cursor.close()
 
+    def ensure_indexes(self, connection):
+        """
+        Create this check's recommended indexes if they are missing.
+
+        Turns the check's dominant operation from a table scan into a
+        narrow index scan. No-op unless ENSURE_INDEXES is enabled in the
+        environment, since the database user is often read-only. MySQL has
+        no CREATE INDEX IF NOT EXISTS, so existence is probed via
+        SHOW INDEX first.
+
+        Args:
+            connection: MySQL connection object
+        """
+        if not self.RECOMMENDED_INDEXES or not CheckConfig.should_ensure_indexes():
+            return
+
+        cursor = connection.cursor()
+        try:
+            for table, index_name, columns in self.RECOMMENDED_INDEXES:
+                cursor.execute(
+                    f"SHOW INDEX FROM {table} WHERE Key_name = %s",
+                    (index_name,)
+                )
+                if cursor.fetchall():
+                    continue
+                cursor.execute(f"CREATE INDEX {index_name} ON {table} ({columns})")
+        finally:
+            cursor.close()
+
+    def _execute_prepared(self, connection, query, params=None):
+        """
+        Execute a query through a cached prepared cursor.
+
+        The statement is prepared once per run and the cursor is kept open
+        for reuse, so repeat executions send only the bound parameters. A
+        run uses exactly one connection, so the cache is keyed on the
+        statement alone; the check's finally must call
+        close_prepared_cursors before releasing the connection so no cursor
+        outlives the connection it was prepared on.
+
+        Args:
+            connection: MySQL connection object
+            query: SQL query string
+            params: Optional parameters for parameterized queries
+
+        Returns:
+            list: List of result tuples
+        """
+        cursor = self._prepared_cursors.get(query)
+        if cursor is None:
+            cursor = connection.cursor(prepared=True)
+            self._prepared_cursors[query] = cursor
+        cursor.execute(query, params or ())
+        return cursor.fetchall()
+
+    def close_prepared_cursors(self):
+        """
+        Close and drop all prepared cursors from the current run.
+
+        Called from each check's finally so cursors never outlive the run's
+        connection or leak when the check instance is kept alive across
+        repeated runs.
+        """
+        for cursor in self._prepared_cursors.values():
+            try:
+                cursor.close()
+            except Exception:
+                pass
+        self._prepared_cursors.clear()
+
+    def execute_queries(self, connection, queries):
+        """
+        Execute several SQL statements on a single shared cursor.
+
+        The statements run back to back on one cursor, so only the cursor
+        setup cost is amortized, not the per-statement round trip: the
+        multi-statement protocol (cmd_query_iter) is not implemented by the
+        C-extension connection class that the pool prefers on standard
+        installs. Statements must be fully rendered.
+
+        Args:
+            connection: MySQL connection object
+            queries: List of SQL statement strings
+
+        Returns:
+            list: One list of result tuples per statement (empty list for
+                statements that produce no result set)
+        """
+        all_results = []
+        cursor = connection.cursor()
+        try:
+            for query in queries:
+                cursor.execute(query)
+                if cursor.with_rows:
+                    all_results.append(cursor.fetchall())
+                else:
+                    all_results.append([])
+        finally:
+            cursor.close()
+        return all_results
+
+    @staticmethod
+    def _iter_rows(cursor):
+        """Yield rows from a cursor, closing it when exhausted."""
+        try:
+            for row in cursor:
+                yield row
+        finally:
+            cursor.close()
+
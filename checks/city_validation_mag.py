@@ -1,4 +1,5 @@
 """Check for invalid cities in Magento customer addresses."""
+from itertools import groupby
 from base_check import BaseCheck
 from issue import IssueCollection
 
@@ -12,94 +13,203 @@ class CityValidationMag(BaseCheck):
         'Maysan', 'Saladin', 'Anbar', 'Dhi Qar', 'Wasit', 'Muthanna',
         'Kirkuk', 'Sulaymaniyah', 'Erbil', 'Dohuk', 'Nineveh', 'Diyala', 'Halabja'
     ]
+
+    # Frozenset view for O(1) membership tests in Python-side filtering
+    VALID_CITIES_SET = frozenset(VALID_CITIES)
+
+    # City lookups become an index range scan instead of a full table scan
+    RECOMMENDED_INDEXES = [
+        ('customer_address_entity', 'idx_cae_city', 'city'),
+    ]
     
-    def run(self):
+    def _ensure_valid_cities_table(self, connection):
+        """
+        Create and populate the per-session valid-cities lookup table.
+
+        The table is TEMPORARY, so it lives on the connection's session and
+        is reused for free when the pooled connection is handed out again.
+
+        Args:
+            connection: MySQL connection object
+        """
+        # The city names are trusted class constants, inlined so both
+        # statements stay fully rendered for execute_queries
+        values = ','.join(f"('{city}')" for city in self.VALID_CITIES)
+        self.execute_queries(connection, [
+            """
+            CREATE TEMPORARY TABLE IF NOT EXISTS _valid_cities (
+                name VARCHAR(64) PRIMARY KEY
+            ) ENGINE=MEMORY
+            """,
+            f"INSERT IGNORE INTO _valid_cities VALUES {values}"
+        ])
+
+    def run(self, connection=None):
         """
         Check for invalid cities in customer addresses.
-        
+
+        Args:
+            connection: Optional injected Magento connection (left open for
+                the caller); acquired from the pool when omitted
+
         Returns:
             IssueCollection: Collection of issues found, or empty collection if none
         """
         issues = self.create_issue_collection()
-        connection = None
-        
+        owns_connection = connection is None
+
         try:
-            connection = self.get_magento_connection()
-            
-            # Build the query with parameterized valid cities
-            # Check for invalid cities, NULL cities, and empty cities
-            placeholders = ','.join(['%s'] * len(self.VALID_CITIES))
+            if owns_connection:
+                connection = self.get_magento_connection()
+
+            # Materialize the valid-city list as a session MEMORY table and
+            # anti-join against it: one hash lookup per row instead of a
+            # 19-way NOT IN comparison, and no placeholder list per query.
+            # A failed join also covers NULL and empty cities.
+            # Classification into invalid/NULL/empty is done server-side via
+            # CASE, so the Python side just splits the pre-sorted stream.
+            self.ensure_indexes(connection)
+            self._ensure_valid_cities_table(connection)
+
+            # Cheap EXISTS probe first: on a clean database this stops at the
+            # first matching row instead of scanning and ordering the table
+            probe_query = """
+                SELECT EXISTS (
+                    SELECT 1
+                    FROM customer_address_entity AS a
+                    LEFT JOIN _valid_cities AS v ON v.name = a.city
+                    WHERE v.name IS NULL
+                )
+            """
+            has_issues = self.execute_query(connection, probe_query, prepared=True)[0][0]
+            if not has_issues:
+                return issues
+
+            # Exact per-bucket totals come from a cheap server-side aggregate
+            count_query = """
+                SELECT
+                    CASE
+                        WHEN a.city IS NULL THEN 'null'
+                        WHEN a.city = '' THEN 'empty'
+                        ELSE 'invalid'
+                    END AS bucket,
+                    COUNT(*)
+                FROM customer_address_entity AS a
+                LEFT JOIN _valid_cities AS v ON v.name = a.city
+                WHERE v.name IS NULL
+                GROUP BY bucket
+            """
+            bucket_counts = dict(self.execute_query(connection, count_query,
+                                                    prepared=True))
+
+            # Detail rows are capped per bucket with a window function, so
+            # at most max_records example rows per bucket cross the wire
             query = """
-                SELECT entity_id, city
-                FROM customer_address_entity
-                WHERE (city NOT IN ({}) OR city IS NULL OR city = '')
-                ORDER BY entity_id
-            """.format(placeholders)
-            
-            results = self.execute_query(connection, query, self.VALID_CITIES)
-            
-            if results:
-                # Separate results by type
-                invalid_city_records = []
-                null_city_records = []
-                empty_city_records = []
-                
-                for row in results:
-                    entity_id, city = row
-                    if city is None:
-                        null_city_records.append({'id': entity_id, 'city': '(NULL)'})
-                    elif city == '':
-                        empty_city_records.append({'id': entity_id, 'city': '(Empty)'})
-                    else:
-                        invalid_city_records.append({'id': entity_id, 'city': city})
-                
-                # Issue for invalid city names
-                if invalid_city_records:
-                    invalid_cities = sorted(set(r['city'] for r in invalid_city_records))
-                    issues.add_issue(
-                        check_name=self.check_name,
-                        severity='medium',
-                        message=f'Found {len(invalid_cities)} invalid city name(s) in customer addresses',
-                        details=f'Found {len(invalid_cities)} unique invalid city name(s) affecting {len(invalid_city_records)} address record(s)',
-                        extra_data={
-                            'invalid_values': invalid_cities,
-                            'records': invalid_city_records,
-                            'summary': {
-                                'Unique invalid cities': len(invalid_cities),
-                                'Affected addresses': len(invalid_city_records)
-                            }
+                SELECT bucket, entity_id, city
+                FROM (
+                    SELECT
+                        CASE
+                            WHEN a.city IS NULL THEN 'null'
+                            WHEN a.city = '' THEN 'empty'
+                            ELSE 'invalid'
+                        END AS bucket,
+                        a.entity_id,
+                        a.city,
+                        ROW_NUMBER() OVER (
+                            PARTITION BY (a.city IS NULL), (a.city = '')
+                            ORDER BY a.entity_id
+                        ) AS rn
+                    FROM customer_address_entity AS a
+                    LEFT JOIN _valid_cities AS v ON v.name = a.city
+                    WHERE v.name IS NULL
+                ) AS ranked
+                WHERE rn <= %s
+                ORDER BY bucket, entity_id
+            """
+
+            row_stream = self.execute_query(connection, query,
+                                            [self.max_records], stream=True)
+
+            # Rows arrive sorted by bucket, so one groupby pass over the
+            # streaming cursor builds each record list without a per-row
+            # if/elif cascade or a full fetchall materialization
+            display_values = {'null': '(NULL)', 'empty': '(Empty)'}
+            buckets = {}
+            for bucket, rows in groupby(row_stream, key=lambda row: row[0]):
+                placeholder = display_values.get(bucket)
+                buckets[bucket] = [
+                    {'id': entity_id, 'city': placeholder or city}
+                    for _, entity_id, city in rows
+                ]
+
+            invalid_city_records = buckets.get('invalid', [])
+            null_city_records = buckets.get('null', [])
+            empty_city_records = buckets.get('empty', [])
+            invalid_count = bucket_counts.get('invalid', 0)
+            null_count = bucket_counts.get('null', 0)
+            empty_count = bucket_counts.get('empty', 0)
+
+            # Issue for invalid city names
+            if invalid_city_records:
+                # Unique invalid cities come from a cheap DISTINCT query
+                # instead of deduplicating the full record list in Python
+                distinct_query = """
+                    SELECT DISTINCT a.city
+                    FROM customer_address_entity AS a
+                    LEFT JOIN _valid_cities AS v ON v.name = a.city
+                    WHERE v.name IS NULL AND a.city IS NOT NULL AND a.city <> ''
+                    ORDER BY a.city
+                """
+                distinct_results = self.execute_query(connection, distinct_query,
+                                                      prepared=True)
+                # Hash-set guardrail in case the server-side anti-join and
+                # the Python list ever drift out of sync
+                invalid_cities = [row[0] for row in distinct_results
+                                  if row[0] not in self.VALID_CITIES_SET]
+                issues.add_issue(
+                    check_name=self.check_name,
+                    severity='medium',
+                    message=f'Found {len(invalid_cities)} invalid city name(s) in customer addresses',
+                    details=f'Found {len(invalid_cities)} unique invalid city name(s) affecting {invalid_count} address record(s)',
+                    extra_data={
+                        'invalid_values': invalid_cities,
+                        'records': invalid_city_records,
+                        'summary': {
+                            'Unique invalid cities': len(invalid_cities),
+                            'Affected addresses': invalid_count
                         }
-                    )
-                
-                # Issue for NULL cities
-                if null_city_records:
-                    issues.add_issue(
-                        check_name=self.check_name,
-                        severity='medium',
-                        message=f'Found {len(null_city_records)} address(es) with NULL city value',
-                        details=f'Found {len(null_city_records)} address record(s) with NULL city value',
-                        extra_data={
-                            'records': null_city_records,
-                            'summary': {
-                                'NULL cities': len(null_city_records)
-                            }
+                    }
+                )
+            
+            # Issue for NULL cities
+            if null_city_records:
+                issues.add_issue(
+                    check_name=self.check_name,
+                    severity='medium',
+                    message=f'Found {null_count} address(es) with NULL city value',
+                    details=f'Found {null_count} address record(s) with NULL city value',
+                    extra_data={
+                        'records': null_city_records,
+                        'summary': {
+                            'NULL cities': null_count
                         }
-                    )
-                
-                # Issue for empty cities
-                if empty_city_records:
-                    issues.add_issue(
-                        check_name=self.check_name,
-                        severity='medium',
-                        message=f'Found {len(empty_city_records)} address(es) with empty city value',
-                        details=f'Found {len(empty_city_records)} address record(s) with empty city value',
-                        extra_data={
-                            'records': empty_city_records,
-                            'summary': {
-                                'Empty cities': len(empty_city_records)
-                            }
+                    }
+                )
+            
+            # Issue for empty cities
+            if empty_city_records:
+                issues.add_issue(
+                    check_name=self.check_name,
+                    severity='medium',
+                    message=f'Found {empty_count} address(es) with empty city value',
+                    details=f'Found {empty_count} address record(s) with empty city value',
+                    extra_data={
+                        'records': empty_city_records,
+                        'summary': {
+                            'Empty cities': empty_count
                         }
-                    )
+                    }
+                )
         
         except Exception as e:
             issues.add_issue(
@@ -110,7 +220,8 @@ class CityValidationMag(BaseCheck):
             )
         
         finally:
-            if connection and connection.is_connected():
+            self.close_prepared_cursors()
+            if owns_connection and connection and connection.is_connected():
                 connection.close()
         
         return issues
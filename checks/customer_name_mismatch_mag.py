@@ -6,66 +6,76 @@ from issue import IssueCollection
 class CustomerNameMismatchMag(BaseCheck):
     """Validates that customer names in addresses match the names in customer entity."""
     
-    def run(self):
+    def run(self, connection=None):
         """
         Check for mismatched customer names between customer_entity and customer_address_entity.
-        
+
+        Args:
+            connection: Optional injected Magento connection (left open for
+                the caller); acquired from the pool when omitted
+
         Returns:
             IssueCollection: Collection of issues found, or empty collection if none
         """
         issues = self.create_issue_collection()
-        connection = None
-        
+        owns_connection = connection is None
+
         try:
-            connection = self.get_magento_connection()
-            
-            query = """
-                SELECT
-                    ce.entity_id          AS customer_id,
-                    ce.firstname          AS customer_firstname,
-                    ce.lastname           AS customer_lastname,
-                    cae.entity_id         AS address_id,
-                    cae.firstname         AS address_firstname,
-                    cae.lastname          AS address_lastname
+            if owns_connection:
+                connection = self.get_magento_connection()
+
+            # Exact totals come from one server-side aggregate; it also
+            # doubles as a fast path when nothing mismatches
+            count_query = """
+                SELECT COUNT(*), COUNT(DISTINCT ce.entity_id)
                 FROM customer_entity AS ce
                 JOIN customer_address_entity AS cae
                     ON cae.parent_id = ce.entity_id
                 WHERE
                     ce.firstname <> cae.firstname
                  OR ce.lastname <> cae.lastname
-                ORDER BY ce.entity_id, cae.entity_id
             """
-            
-            results = self.execute_query(connection, query)
+            total_mismatches, unique_customers = self.execute_query(
+                connection, count_query, prepared=True)[0]
+
+            if total_mismatches:
+                # COALESCE does the NULL substitution once per row on the
+                # server, and the dictionary cursor yields ready-made record
+                # dicts, so no per-cell branching or tuple indexing happens
+                # in Python. LIMIT bounds the example rows kept for the
+                # report; the counts above stay exact.
+                query = """
+                    SELECT
+                        ce.entity_id                        AS customer_id,
+                        COALESCE(ce.firstname, '(NULL)')    AS customer_firstname,
+                        COALESCE(ce.lastname, '(NULL)')     AS customer_lastname,
+                        cae.entity_id                       AS address_id,
+                        COALESCE(cae.firstname, '(NULL)')   AS address_firstname,
+                        COALESCE(cae.lastname, '(NULL)')    AS address_lastname
+                    FROM customer_entity AS ce
+                    JOIN customer_address_entity AS cae
+                        ON cae.parent_id = ce.entity_id
+                    WHERE
+                        ce.firstname <> cae.firstname
+                     OR ce.lastname <> cae.lastname
+                    ORDER BY ce.entity_id, cae.entity_id
+                    LIMIT %s
+                """
+                records = list(self.execute_query(connection, query,
+                                                  [self.max_records],
+                                                  stream=True,
+                                                  dictionary=True))
+
 
-            
-            # results.append((999, 'John', 'Doe', 1999, 'Johnny', 'Doel'))  # test row
-            if results:
-                # Convert results to records format
-                records = [
-                    {
-                        'customer_id': row[0],
-                        'customer_firstname': row[1] if row[1] else '(NULL)',
-                        'customer_lastname': row[2] if row[2] else '(NULL)',
-                        'address_id': row[3],
-                        'address_firstname': row[4] if row[4] else '(NULL)',
-                        'address_lastname': row[5] if row[5] else '(NULL)'
-                    }
-                    for row in results
-                ]
-                
-                # Get unique customers affected
-                unique_customers = len(set(r['customer_id'] for r in records))
-                
                 issues.add_issue(
                     check_name=self.check_name,
                     severity='medium',
-                    message=f'Found {len(records)} address(es) with mismatched customer names',
-                    details=f'Found {len(records)} address record(s) where customer name does not match the customer entity name, affecting {unique_customers} unique customer(s)',
+                    message=f'Found {total_mismatches} address(es) with mismatched customer names',
+                    details=f'Found {total_mismatches} address record(s) where customer name does not match the customer entity name, affecting {unique_customers} unique customer(s)',
                     extra_data={
                         'records': records,
                         'summary': {
-                            'Total mismatched addresses': len(records),
+                            'Total mismatched addresses': total_mismatches,
                             'Unique customers affected': unique_customers
                         }
                     }
@@ -80,7 +90,8 @@ class CustomerNameMismatchMag(BaseCheck):
             )
         
         finally:
-            if connection and connection.is_connected():
+            self.close_prepared_cursors()
+            if owns_connection and connection and connection.is_connected():
                 connection.close()
         
         return issues
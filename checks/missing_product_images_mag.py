@@ -1,4 +1,5 @@
 """Check for missing Magento product image attributes."""
+from collections import Counter
 from base_check import BaseCheck
 from issue import IssueCollection
 
@@ -8,96 +9,163 @@ class MissingProductImagesMag(BaseCheck):
     
     # Image attribute codes to check
     IMAGE_ATTRIBUTES = ['image', 'small_image', 'thumbnail', 'swatch_image']
+
+    # Store scopes to check (0 = default/admin scope)
+    STORE_IDS = [0, 1, 2]
+
+    # Covering index so the attribute-value probes never touch the base rows
+    RECOMMENDED_INDEXES = [
+        ('catalog_product_entity_varchar', 'idx_cpev_entity_attr_store_value',
+         'entity_id, attribute_id, store_id, value'),
+    ]
     
-    def run(self):
+    def run(self, connection=None):
         """
         Check for missing product image attributes.
-        
+
+        Args:
+            connection: Optional injected Magento connection (left open for
+                the caller); acquired from the pool when omitted
+
         Returns:
             IssueCollection: Collection of issues found, or empty collection if none
         """
         issues = self.create_issue_collection()
-        connection = None
-        
+        owns_connection = connection is None
+
         try:
-            connection = self.get_magento_connection()
-            
-            # Use the exact query structure provided, selecting data fields instead of INSERT statements
+            if owns_connection:
+                connection = self.get_magento_connection()
+
+            self.ensure_indexes(connection)
+
+            # SELECT DISTINCT dedupes (attribute_id, entity_id) on the
+            # server, and the unbounded src self-join is replaced by an
+            # EXISTS probe, so only the true result cardinality crosses the
+            # wire and no Python-side dedup pass is needed. The store scope
+            # is a bound parameter rather than a hand-rolled UNION derived
+            # table, so the optimizer keeps store_id as an index lookup
+            # instead of materializing a cross product.
             placeholders = ','.join(['%s'] * len(self.IMAGE_ATTRIBUTES))
+
+            # Exact per-attribute totals per store via server-side aggregates
+            count_query = """
+                SELECT ea.attribute_code, COUNT(DISTINCT p.entity_id)
+                FROM catalog_product_entity AS p
+                CROSS JOIN eav_attribute AS ea
+                LEFT JOIN catalog_product_entity_varchar AS cpev
+                    ON cpev.entity_id = p.entity_id
+                    AND cpev.attribute_id = ea.attribute_id
+                    AND cpev.store_id = %s
+                WHERE ea.attribute_code IN ({})
+                  AND cpev.value IS NULL
+                  AND EXISTS (
+                      SELECT 1
+                      FROM catalog_product_entity_varchar AS src
+                      WHERE src.entity_id = p.entity_id
+                        AND src.attribute_id = ea.attribute_id
+                        AND src.value IS NOT NULL
+                  )
+                GROUP BY ea.attribute_code
+            """.format(placeholders)
+
+            # Detail rows are sample rows only; LIMIT bounds what is fetched
             query = """
-                SELECT 
+                SELECT DISTINCT
                     ea.attribute_id,
-                    s.store_id,
                     p.entity_id,
                     ea.attribute_code
                 FROM catalog_product_entity AS p
-                CROSS JOIN (SELECT 0 AS store_id UNION SELECT 1 UNION SELECT 2) AS s
                 CROSS JOIN eav_attribute AS ea
                 LEFT JOIN catalog_product_entity_varchar AS cpev
-                    ON cpev.entity_id = p.entity_id 
+                    ON cpev.entity_id = p.entity_id
                     AND cpev.attribute_id = ea.attribute_id
-                    AND cpev.store_id = s.store_id
-                LEFT JOIN (
-                    SELECT entity_id, attribute_id, value
-                    FROM catalog_product_entity_varchar
-                    WHERE value IS NOT NULL
-                ) AS src
-                    ON src.entity_id = p.entity_id
-                    AND src.attribute_id = ea.attribute_id
+                    AND cpev.store_id = %s
                 WHERE ea.attribute_code IN ({})
                   AND cpev.value IS NULL
-                  AND src.value IS NOT NULL
+                  AND EXISTS (
+                      SELECT 1
+                      FROM catalog_product_entity_varchar AS src
+                      WHERE src.entity_id = p.entity_id
+                        AND src.attribute_id = ea.attribute_id
+                        AND src.value IS NOT NULL
+                  )
+                LIMIT %s
             """.format(placeholders)
-            
-            results = self.execute_query(connection, query, self.IMAGE_ATTRIBUTES)
-            
-            if results:
-                # Track unique combinations for counting (attribute_id, store_id, entity_id)
-                records = []
-                seen_combinations = set()
-                
-                for row in results:
-                    attribute_id, store_id, entity_id, attribute_code = row
-                    
-                    # Double-check: skip if any key field is NULL (shouldn't happen due to WHERE clause, but safety check)
-                    if attribute_id is None or store_id is None or entity_id is None or attribute_code is None:
-                        continue
-                    
-                    # Track unique combinations for counting
-                    combination = (attribute_id, store_id, entity_id)
-                    if combination not in seen_combinations:
-                        seen_combinations.add(combination)
-                        records.append({
-                            'id': entity_id,
-                            'attribute_id': attribute_id,
-                            'attribute_code': attribute_code,
-                            'store_id': store_id
-                        })
-                
-                if records:
-                    # Count by attribute code
-                    attribute_counts = {}
-                    for record in records:
-                        attr_code = record['attribute_code']
-                        attribute_counts[attr_code] = attribute_counts.get(attr_code, 0) + 1
-                    
-                    # Get unique products affected
-                    unique_products = len(set(r['id'] for r in records))
-                    
-                    issues.add_issue(
-                        check_name=self.check_name,
-                        severity='medium',
-                        message=f'Found {len(records)} missing product image attribute(s)',
-                        details=f'Found {len(records)} missing image attribute value(s) affecting {unique_products} unique product(s)',
-                        extra_data={
-                            'records': records,
-                            'summary': {
-                                'Total missing attributes': len(records),
-                                'Unique products affected': unique_products,
-                                'By attribute': attribute_counts
-                            }
+
+            records = []
+            attribute_counts = Counter()
+            for store_id in self.STORE_IDS:
+                store_counts = self.execute_query(
+                    connection, count_query,
+                    [store_id, *self.IMAGE_ATTRIBUTES], prepared=True
+                )
+                for attribute_code, missing in store_counts:
+                    attribute_counts[attribute_code] += missing
+
+                remaining = self.max_records - len(records)
+                if remaining <= 0:
+                    continue
+                row_stream = self.execute_query(
+                    connection, query,
+                    [store_id, *self.IMAGE_ATTRIBUTES, remaining], stream=True
+                )
+                for attribute_id, entity_id, attribute_code in row_stream:
+                    records.append({
+                        'id': entity_id,
+                        'attribute_id': attribute_id,
+                        'attribute_code': attribute_code,
+                        'store_id': store_id
+                    })
+
+            total_missing = sum(attribute_counts.values())
+
+            if total_missing:
+                # Unique products with at least one missing scope, counted
+                # server-side across all store scopes in one aggregate
+                store_placeholders = ','.join(['%s'] * len(self.STORE_IDS))
+                unique_query = """
+                    SELECT COUNT(DISTINCT p.entity_id)
+                    FROM catalog_product_entity AS p
+                    CROSS JOIN eav_attribute AS ea
+                    WHERE ea.attribute_code IN ({})
+                      AND EXISTS (
+                          SELECT 1
+                          FROM catalog_product_entity_varchar AS src
+                          WHERE src.entity_id = p.entity_id
+                            AND src.attribute_id = ea.attribute_id
+                            AND src.value IS NOT NULL
+                      )
+                      AND (
+                          SELECT COUNT(*)
+                          FROM catalog_product_entity_varchar AS cpev
+                          WHERE cpev.entity_id = p.entity_id
+                            AND cpev.attribute_id = ea.attribute_id
+                            AND cpev.store_id IN ({})
+                            AND cpev.value IS NOT NULL
+                      ) < %s
+                """.format(placeholders, store_placeholders)
+                unique_products = self.execute_query(
+                    connection, unique_query,
+                    [*self.IMAGE_ATTRIBUTES, *self.STORE_IDS,
+                     len(self.STORE_IDS)], prepared=True
+                )[0][0]
+
+
+                issues.add_issue(
+                    check_name=self.check_name,
+                    severity='medium',
+                    message=f'Found {total_missing} missing product image attribute(s)',
+                    details=f'Found {total_missing} missing image attribute value(s) affecting {unique_products} unique product(s)',
+                    extra_data={
+                        'records': records,
+                        'summary': {
+                            'Total missing attributes': total_missing,
+                            'Unique products affected': unique_products,
+                            'By attribute': dict(attribute_counts)
                         }
-                    )
+                    }
+                )
         
         except Exception as e:
             issues.add_issue(
@@ -108,7 +176,8 @@ class MissingProductImagesMag(BaseCheck):
             )
         
         finally:
-            if connection and connection.is_connected():
+            self.close_prepared_cursors()
+            if owns_connection and connection and connection.is_connected():
                 connection.close()
         
         return issues
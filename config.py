@@ -1,6 +1,9 @@
 """Configuration management for database connections and email settings."""
+import functools
 import os
+import threading
 from dotenv import load_dotenv
+from mysql.connector import pooling
 
 # Load environment variables from .env file
 load_dotenv()
@@ -8,39 +11,99 @@ load_dotenv()
 
 class DatabaseConfig:
     """Database configuration for Magento and ERP."""
-    
+
+    # Shared connection pools (created lazily on first use). The first call
+    # comes concurrently from every worker thread, and building a pool opens
+    # POOL_SIZE real connections, so creation is serialized behind a lock to
+    # keep racing threads from each building (and leaking) their own pool
+    _magento_pool = None
+    _erp_pool = None
+    _pool_lock = threading.Lock()
+
+    # Number of connections kept per pool
+    POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 8))
+
     @staticmethod
+    @functools.lru_cache(maxsize=1)
     def get_magento_config():
-        """Get Magento database configuration."""
+        """Get Magento database configuration (cached after first call)."""
         return {
             'host': os.getenv('MAGENTO_DB_HOST', 'localhost'),
             'port': int(os.getenv('MAGENTO_DB_PORT', 3306)),
             'user': os.getenv('MAGENTO_DB_USER', ''),
             'password': os.getenv('MAGENTO_DB_PASSWORD', ''),
             'database': os.getenv('MAGENTO_DB_NAME', ''),
+            # Silently consume unread rows on cursor close / session reset,
+            # so a check failing mid-iteration of a streaming cursor cannot
+            # poison the connection for whoever uses it next
+            'consume_results': True,
         }
     
     @staticmethod
+    @functools.lru_cache(maxsize=1)
     def get_erp_config():
-        """Get ERP database configuration."""
+        """Get ERP database configuration (cached after first call)."""
         return {
             'host': os.getenv('ERP_DB_HOST', 'localhost'),
             'port': int(os.getenv('ERP_DB_PORT', 3306)),
             'user': os.getenv('ERP_DB_USER', ''),
             'password': os.getenv('ERP_DB_PASSWORD', ''),
             'database': os.getenv('ERP_DB_NAME', ''),
+            # Silently consume unread rows on cursor close / session reset,
+            # so a check failing mid-iteration of a streaming cursor cannot
+            # poison the connection for whoever uses it next
+            'consume_results': True,
         }
 
+    @classmethod
+    def get_magento_pool(cls):
+        """
+        Get the shared Magento connection pool, creating it on first use.
+
+        Returns:
+            mysql.connector.pooling.MySQLConnectionPool: Shared pool instance
+        """
+        if cls._magento_pool is None:
+            with cls._pool_lock:
+                if cls._magento_pool is None:
+                    cls._magento_pool = pooling.MySQLConnectionPool(
+                        pool_name='magento',
+                        pool_size=cls.POOL_SIZE,
+                        **cls.get_magento_config()
+                    )
+        return cls._magento_pool
+
+    @classmethod
+    def get_erp_pool(cls):
+        """
+        Get the shared ERP connection pool, creating it on first use.
+
+        Returns:
+            mysql.connector.pooling.MySQLConnectionPool: Shared pool instance
+        """
+        if cls._erp_pool is None:
+            with cls._pool_lock:
+                if cls._erp_pool is None:
+                    cls._erp_pool = pooling.MySQLConnectionPool(
+                        pool_name='erp',
+                        pool_size=cls.POOL_SIZE,
+                        **cls.get_erp_config()
+                    )
+        return cls._erp_pool
+
 
 class EmailConfig:
     """Email configuration for sending alerts via Microsoft Graph API."""
     
     @staticmethod
+    @functools.lru_cache(maxsize=1)
     def get_config():
-        """Get email configuration."""
+        """Get email configuration (cached after first call)."""
         recipients = os.getenv('EMAIL_RECIPIENTS', '')
-        recipients_list = [r.strip() for r in recipients.split(',')] if recipients else []
-        
+        # Tuple matches the immutable semantics of cached config and skips
+        # re-splitting on every alert; empty entries are filtered out
+        recipients_list = tuple(r.strip() for r in recipients.split(',') if r.strip())
+
         return {
             'client_id': os.getenv('MSAL_CLIENT_ID', ''),
             'client_secret': os.getenv('MSAL_CLIENT_SECRET', ''),
@@ -54,18 +117,48 @@ class CheckConfig:
     """Configuration for data quality checks."""
     
     @staticmethod
+    @functools.lru_cache(maxsize=1)
     def get_disabled_checks():
         """
-        Get list of disabled check names from environment variable.
-        
+        Get disabled check names from environment variable.
+
+        Parsed once per process; use cache_clear() to re-read the
+        environment.
+
         Returns:
-            list: List of disabled check names (case-insensitive, whitespace trimmed)
+            tuple: Disabled check names (case-insensitive, whitespace trimmed)
         """
         disabled_checks = os.getenv('DISABLED_CHECKS', '')
         if not disabled_checks:
-            return []
-        
+            return ()
+
         # Split by comma, strip whitespace, and filter out empty strings
-        disabled_list = [check.strip() for check in disabled_checks.split(',') if check.strip()]
-        return disabled_list
+        return tuple(check.strip() for check in disabled_checks.split(',') if check.strip())
+
+    @staticmethod
+    def get_detail_row_limit():
+        """
+        Get the maximum number of example rows a check reports per issue.
+
+        Summary counts are always exact; this only bounds the detail rows
+        fetched and kept for the report.
+
+        Returns:
+            int: Row limit (default 1000)
+        """
+        return int(os.getenv('CHECK_DETAIL_ROW_LIMIT', 1000))
+
+    @staticmethod
+    def should_ensure_indexes():
+        """
+        Whether checks may create their recommended indexes when missing.
+
+        Disabled by default since the database user is usually read-only;
+        enable on environments where the checks own their supporting
+        indexes.
+
+        Returns:
+            bool: True if ENSURE_INDEXES is set to a truthy value
+        """
+        return os.getenv('ENSURE_INDEXES', '').strip().lower() in ('1', 'true', 'yes')
 
@@ -1,11 +1,63 @@
 """Email reporting functionality for data quality alerts."""
-import msal
-import requests
+import functools
+from html import escape as _html_escape
 import re
+import time
 from datetime import datetime
 from config import EmailConfig
 from issue import IssueCollection
 
+# Compiled once; splits CamelCase check names into words
+_CAMEL_SPLIT_RE = re.compile(r'(?<!^)(?=[A-Z])')
+
+
+@functools.lru_cache(maxsize=256)
+def format_check_name(check_name):
+    """Format a check name by inserting spaces before capital letters."""
+    return _CAMEL_SPLIT_RE.sub(' ', check_name)
+
+
+# Static CSS/head block, identical for every report
+_HTML_HEADER = """
+        <html>
+        <head>
+            <style>
+                body { font-family: Arial, sans-serif; }
+                h1 { color: #000000; }
+                h2 { color: #1976d2; margin-top: 20px; }
+                .issue {
+                    background-color: #fff3cd;
+                    border-left: 4px solid #ffc107;
+                    padding: 10px;
+                    margin: 10px 0;
+                }
+                .severity-high { border-left-color: #d32f2f; background-color: #ffebee; }
+                .severity-medium { border-left-color: #ff9800; background-color: #fff3e0; }
+                .severity-low { border-left-color: #4caf50; background-color: #e8f5e9; }
+                .details { margin-top: 5px; color: #333; font-size: 0.9em; }
+                .extra-data { margin-top: 10px; padding: 10px; background-color: #f5f5f5; border-radius: 4px; }
+                .extra-data-section { margin-top: 10px; }
+                .extra-data-title { font-weight: bold; color: #1976d2; margin-bottom: 5px; }
+                .extra-data-list { margin: 5px 0; padding-left: 20px; }
+                .extra-data-list li { margin: 3px 0; }
+                .extra-data-table { width: 100%; border-collapse: collapse; margin: 10px 0; font-size: 0.9em; }
+                .extra-data-table th { background-color: #1976d2; color: white; padding: 8px; text-align: left; }
+                .extra-data-table td { padding: 6px 8px; border-bottom: 1px solid #ddd; }
+                .extra-data-table tr:nth-child(even) { background-color: #f9f9f9; }
+                .truncation-notice { margin-top: 5px; font-style: italic; color: #666; font-size: 0.85em; }
+                .execution-info { color: #999; font-size: 0.85em; font-style: italic; margin-top: 5px; }
+            </style>
+        </head>
+        <body>
+"""
+
+_HTML_FOOTER = """
+        <hr style="margin-top: 30px; border: none; border-top: 1px solid #ddd;">
+        <p style="color: #666; font-size: 0.9em; margin-top: 20px;">Yazan Majdalawi</p>
+        </body>
+        </html>
+"""
+
 
 class EmailReporter:
     """Handles email composition and sending for data quality issues."""
@@ -16,95 +68,80 @@ class EmailReporter:
     
     def __init__(self):
         self.config = EmailConfig.get_config()
-        self.app = msal.ConfidentialClientApplication(
-            client_id=self.config['client_id'],
-            client_credential=self.config['client_secret'],
-            authority=f"https://login.microsoftonline.com/{self.config['tenant_id']}"
-        )
+        # msal and requests are imported lazily on first send, so runs that
+        # never send an email never pay for the Azure auth stack
+        self.app = None
+        self._session = None
+        self._token = None
+        self._token_expiry = 0
+        # Recipients and endpoint never change for a reporter's lifetime;
+        # build them once instead of per send
+        self._recipients = [{"emailAddress": {"address": email}}
+                            for email in self.config['recipients']]
+        self._send_url = f"https://graph.microsoft.com/v1.0/users/{self.config['sender']}/sendMail"
+
+    def _get_session(self):
+        """Get the keep-alive HTTPS session, creating it on first use."""
+        if self._session is None:
+            import requests
+            self._session = requests.Session()
+        return self._session
     
-    def format_issues(self, issues: IssueCollection, execution_info: str = None):
+    def format_issues(self, issues: IssueCollection, execution_info: str = None,
+                      *, groups=None, total=None):
         """
         Format issues into a readable email body.
-        
+
         Args:
             issues: IssueCollection object
             execution_info: Optional execution mode information to display
-            
+            groups: Precomputed issues.group_by_check() result (optional)
+            total: Precomputed len(issues) (optional)
+
         Returns:
             str: Formatted email body (HTML)
         """
         if issues.is_empty():
             return ""
-        
-        # Group issues by check name using IssueCollection method
-        issues_by_check = issues.group_by_check()
-        
-        # Build HTML email body
-        html_body = f"""
-        <html>
-        <head>
-            <style>
-                body {{ font-family: Arial, sans-serif; }}
-                h1 {{ color: #000000; }}
-                h2 {{ color: #1976d2; margin-top: 20px; }}
-                .issue {{ 
-                    background-color: #fff3cd; 
-                    border-left: 4px solid #ffc107; 
-                    padding: 10px; 
-                    margin: 10px 0; 
-                }}
-                .severity-high {{ border-left-color: #d32f2f; background-color: #ffebee; }}
-                .severity-medium {{ border-left-color: #ff9800; background-color: #fff3e0; }}
-                .severity-low {{ border-left-color: #4caf50; background-color: #e8f5e9; }}
-                .details {{ margin-top: 5px; color: #333; font-size: 0.9em; }}
-                .extra-data {{ margin-top: 10px; padding: 10px; background-color: #f5f5f5; border-radius: 4px; }}
-                .extra-data-section {{ margin-top: 10px; }}
-                .extra-data-title {{ font-weight: bold; color: #1976d2; margin-bottom: 5px; }}
-                .extra-data-list {{ margin: 5px 0; padding-left: 20px; }}
-                .extra-data-list li {{ margin: 3px 0; }}
-                .extra-data-table {{ width: 100%; border-collapse: collapse; margin: 10px 0; font-size: 0.9em; }}
-                .extra-data-table th {{ background-color: #1976d2; color: white; padding: 8px; text-align: left; }}
-                .extra-data-table td {{ padding: 6px 8px; border-bottom: 1px solid #ddd; }}
-                .extra-data-table tr:nth-child(even) {{ background-color: #f9f9f9; }}
-                .truncation-notice {{ margin-top: 5px; font-style: italic; color: #666; font-size: 0.85em; }}
-                .execution-info {{ color: #999; font-size: 0.85em; font-style: italic; margin-top: 5px; }}
-            </style>
-        </head>
-        <body>
+
+        # Group issues by check name unless the caller already did
+        if groups is None:
+            groups = issues.group_by_check()
+        if total is None:
+            total = len(issues)
+
+        # Build HTML email body in a parts list; one final join instead of
+        # quadratic string reallocation
+        parts = [_HTML_HEADER]
+        parts.append(f"""
             <h1>Data Quality Alert Report</h1>
             <p><strong>Date:</strong> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-            <p><strong>Total Issues Found:</strong> {len(issues)}</p>
-        """
-        
+            <p><strong>Total Issues Found:</strong> {total}</p>
+        """)
+
         # Add execution info if provided
         if execution_info:
-            html_body += f'<p class="execution-info">Execution mode: {execution_info}</p>\n'
-        
-        for check_name, check_issues in issues_by_check.items():
+            parts.append(f'<p class="execution-info">Execution mode: {execution_info}</p>\n')
+
+        for check_name, check_issues in groups.items():
             formatted_name = self._format_check_name(check_name)
-            html_body += f'<h2>{formatted_name}</h2>\n'
+            parts.append(f'<h2>{formatted_name}</h2>\n')
             for issue in check_issues:
-                severity_class = f"severity-{issue.severity}"
-                html_body += f"""
-                <div class="issue {severity_class}">
+                parts.append(f"""
+                <div class="issue severity-{issue.severity}">
                     <strong>[{issue.severity.upper()}]</strong> {issue.message}
-                """
+                """)
                 # Add details if present
                 if issue.details:
-                    html_body += f'<div class="details">{issue.details}</div>'
+                    parts.append(f'<div class="details">{issue.details}</div>')
                 # Add extra_data if present
                 if issue.has_extra_data():
-                    html_body += self._format_extra_data(issue.extra_data)
-                html_body += "</div>\n"
-        
-        html_body += """
-        <hr style="margin-top: 30px; border: none; border-top: 1px solid #ddd;">
-        <p style="color: #666; font-size: 0.9em; margin-top: 20px;">Yazan Majdalawi</p>
-        </body>
-        </html>
-        """
-        
-        return html_body
+                    parts.append(self._format_extra_data(issue.extra_data))
+                parts.append("</div>\n")
+
+        parts.append(_HTML_FOOTER)
+
+        return ''.join(parts)
     
     def _format_extra_data(self, extra_data):
         """
@@ -116,129 +153,152 @@ class EmailReporter:
         Returns:
             str: HTML formatted extra_data
         """
-        html = '<div class="extra-data">'
-        
+        parts = ['<div class="extra-data">']
+
         # Format entity_ids
         if 'entity_ids' in extra_data and extra_data['entity_ids']:
-            html += self._format_list(
+            parts.append(self._format_list(
                 extra_data['entity_ids'],
                 'Entity IDs',
                 self.MAX_LIST_ITEMS
-            )
-        
+            ))
+
         # Format invalid_values
         if 'invalid_values' in extra_data and extra_data['invalid_values']:
-            html += self._format_list(
+            parts.append(self._format_list(
                 extra_data['invalid_values'],
                 'Invalid Values',
                 self.MAX_LIST_ITEMS
-            )
-        
+            ))
+
         # Format records (tabular data)
         if 'records' in extra_data and extra_data['records']:
-            html += self._format_table(
+            parts.append(self._format_table(
                 extra_data['records'],
                 self.MAX_TABLE_ROWS
-            )
-        
+            ))
+
         # Format summary
         if 'summary' in extra_data and extra_data['summary']:
-            html += self._format_summary(extra_data['summary'])
-        
-        html += '</div>'
-        return html
+            parts.append(self._format_summary(extra_data['summary']))
+
+        parts.append('</div>')
+        return ''.join(parts)
     
     def _format_list(self, items, title, max_items):
         """Format a list of items with truncation."""
-        html = f'<div class="extra-data-section">'
-        html += f'<div class="extra-data-title">{title}:</div>'
-        html += '<ul class="extra-data-list">'
-        
+        parts = [
+            '<div class="extra-data-section">',
+            f'<div class="extra-data-title">{title}:</div>',
+            '<ul class="extra-data-list">'
+        ]
+
         total_count = len(items)
         display_items = items[:max_items]
-        
+
         for item in display_items:
-            html += f'<li>{self._escape_html(str(item))}</li>'
-        
-        html += '</ul>'
-        
+            parts.append(f'<li>{self._escape_html(str(item))}</li>')
+
+        parts.append('</ul>')
+
         if total_count > max_items:
-            html += f'<div class="truncation-notice">Showing first {max_items} of {total_count} items</div>'
-        
-        html += '</div>'
-        return html
+            parts.append(f'<div class="truncation-notice">Showing first {max_items} of {total_count} items</div>')
+
+        parts.append('</div>')
+        return ''.join(parts)
     
     def _format_table(self, records, max_rows):
         """Format records as an HTML table with truncation."""
         if not records:
             return ''
-        
-        html = '<div class="extra-data-section">'
-        html += '<div class="extra-data-title">Detailed Records:</div>'
-        html += '<table class="extra-data-table">'
-        
-        # Get column headers from first record
+
+        parts = [
+            '<div class="extra-data-section">',
+            '<div class="extra-data-title">Detailed Records:</div>',
+            '<table class="extra-data-table">'
+        ]
+
+        # Escape column headers once rather than per row, and bind the
+        # escaper locally to skip the bound-method lookup per cell
+        esc = self._escape_html
         headers = list(records[0].keys())
-        html += '<thead><tr>'
-        for header in headers:
-            html += f'<th>{self._escape_html(str(header))}</th>'
-        html += '</tr></thead>'
-        
+        escaped_headers = [esc(str(header)) for header in headers]
+        parts.append('<thead><tr>')
+        for header in escaped_headers:
+            parts.append(f'<th>{header}</th>')
+        parts.append('</tr></thead>')
+
         # Add rows
-        html += '<tbody>'
+        parts.append('<tbody>')
         total_count = len(records)
         display_records = records[:max_rows]
-        
+
         for record in display_records:
-            html += '<tr>'
+            parts.append('<tr>')
             for header in headers:
                 value = record.get(header, '')
-                html += f'<td>{self._escape_html(str(value))}</td>'
-            html += '</tr>'
-        
-        html += '</tbody></table>'
-        
+                parts.append(f'<td>{esc(str(value))}</td>')
+            parts.append('</tr>')
+
+        parts.append('</tbody></table>')
+
         if total_count > max_rows:
-            html += f'<div class="truncation-notice">Showing first {max_rows} of {total_count} records</div>'
-        
-        html += '</div>'
-        return html
+            parts.append(f'<div class="truncation-notice">Showing first {max_rows} of {total_count} records</div>')
+
+        parts.append('</div>')
+        return ''.join(parts)
     
     def _format_summary(self, summary):
         """Format summary statistics."""
-        html = '<div class="extra-data-section">'
-        html += '<div class="extra-data-title">Summary:</div>'
-        html += '<ul class="extra-data-list">'
-        
+        parts = [
+            '<div class="extra-data-section">',
+            '<div class="extra-data-title">Summary:</div>',
+            '<ul class="extra-data-list">'
+        ]
+
         for key, value in summary.items():
-            html += f'<li><strong>{self._escape_html(str(key))}:</strong> {self._escape_html(str(value))}</li>'
-        
-        html += '</ul></div>'
-        return html
+            parts.append(f'<li><strong>{self._escape_html(str(key))}:</strong> {self._escape_html(str(value))}</li>')
+
+        parts.append('</ul></div>')
+        return ''.join(parts)
     
     def _format_check_name(self, check_name):
         """Format check name by inserting spaces before capital letters."""
-        # Insert space before capital letters (but not before the first one)
-        formatted = re.sub(r'(?<!^)(?=[A-Z])', ' ', check_name)
-        return formatted
+        return format_check_name(check_name)
     
     def _escape_html(self, text):
         """Escape HTML special characters."""
         if not isinstance(text, str):
             text = str(text)
-        return (text.replace('&', '&amp;')
-                   .replace('<', '&lt;')
-                   .replace('>', '&gt;')
-                   .replace('"', '&quot;')
-                   .replace("'", '&#x27;'))
+        # Single C-level pass; html.escape emits the same entities as the
+        # old chain of five str.replace scans
+        return _html_escape(text, quote=True)
     
     def _get_access_token(self):
-        """Get access token using MSAL."""
+        """Get access token using MSAL, reusing a cached one until expiry."""
+        if self._token and time.time() < self._token_expiry - 60:
+            return self._token
+
+        if self.app is None:
+            import msal
+            self.app = msal.ConfidentialClientApplication(
+                client_id=self.config['client_id'],
+                client_credential=self.config['client_secret'],
+                authority=f"https://login.microsoftonline.com/{self.config['tenant_id']}"
+            )
+
         result = self.app.acquire_token_for_client(scopes=["https://graph.microsoft.com/.default"])
         if "access_token" in result:
-            return result["access_token"]
+            self._token = result["access_token"]
+            self._token_expiry = time.time() + result.get("expires_in", 3599)
+            return self._token
         else:
             raise Exception(f"Failed to acquire token: {result.get('error_description', 'Unknown error')}")
+
+    def close(self):
+        """Close the underlying HTTPS session, if one was opened."""
+        if self._session is not None:
+            self._session.close()
     
     def send_email(self, issues: IssueCollection, execution_info: str = None):
         """
@@ -257,32 +317,37 @@ class EmailReporter:
         try:
             # Get access token
             access_token = self._get_access_token()
-            
-            # Create email message
-            html_body = self.format_issues(issues, execution_info)
-            
-            # Format recipients
-            recipients = [{"emailAddress": {"address": email}} for email in self.config['recipients']]
-            
+
+            # Create email message; total and groups are computed once and
+            # shared between the subject line and the body builder
+            total = len(issues)
+            html_body = self.format_issues(issues, execution_info,
+                                           groups=issues.group_by_check(),
+                                           total=total)
+
             message = {
                 "message": {
-                    "subject": f'Data Quality Alert - {len(issues)} Issue(s) Found',
+                    "subject": f'Data Quality Alert - {total} Issue(s) Found',
                     "body": {
                         "contentType": "HTML",
                         "content": html_body
                     },
-                    "toRecipients": recipients
+                    "toRecipients": self._recipients
                 }
             }
-            
-            # Send email via Microsoft Graph API
-            url = f"https://graph.microsoft.com/v1.0/users/{self.config['sender']}/sendMail"
+
+            # Send email via Microsoft Graph API. orjson encodes the message
+            # (dominated by the HTML body) straight to bytes in one C-level
+            # pass, skipping requests' json.dumps str-then-encode double copy
+            import orjson
             headers = {
                 "Authorization": f"Bearer {access_token}",
                 "Content-Type": "application/json"
             }
-            
-            response = requests.post(url, json=message, headers=headers)
+
+            response = self._get_session().post(self._send_url,
+                                                data=orjson.dumps(message),
+                                                headers=headers, timeout=30)
             response.raise_for_status()
             
             return True
@@ -290,27 +355,103 @@ class EmailReporter:
         except Exception as e:
             print(f"Error sending email: {e}")
             return False
-    
+
+    def send_emails(self, reports):
+        """
+        Send several reports in one round trip via the Graph $batch endpoint.
+
+        The access token is fetched once and all sendMail requests are
+        bundled into $batch calls (up to 20 per call) over the shared
+        session, instead of one POST per report.
+
+        Args:
+            reports: List of (IssueCollection, execution_info) tuples
+
+        Returns:
+            list[bool]: Per-report success flags, in input order
+        """
+        results = [False] * len(reports)
+
+        to_send = []
+        for index, (issues, execution_info) in enumerate(reports):
+            if issues.is_empty():
+                continue
+            total = len(issues)
+            to_send.append((index, {
+                "message": {
+                    "subject": f'Data Quality Alert - {total} Issue(s) Found',
+                    "body": {
+                        "contentType": "HTML",
+                        "content": self.format_issues(issues, execution_info,
+                                                      groups=issues.group_by_check(),
+                                                      total=total)
+                    },
+                    "toRecipients": self._recipients
+                }
+            }))
+
+        if not to_send:
+            return results
+
+        try:
+            import orjson
+            access_token = self._get_access_token()
+            headers = {
+                "Authorization": f"Bearer {access_token}",
+                "Content-Type": "application/json"
+            }
+
+            # Graph accepts at most 20 sub-requests per $batch call
+            for start in range(0, len(to_send), 20):
+                batch = {
+                    "requests": [
+                        {
+                            "id": str(index),
+                            "method": "POST",
+                            "url": f"/users/{self.config['sender']}/sendMail",
+                            "headers": {"Content-Type": "application/json"},
+                            "body": message
+                        }
+                        for index, message in to_send[start:start + 20]
+                    ]
+                }
+                response = self._get_session().post(
+                    "https://graph.microsoft.com/v1.0/$batch",
+                    data=orjson.dumps(batch), headers=headers, timeout=30
+                )
+                response.raise_for_status()
+                for sub_response in response.json().get('responses', []):
+                    if 200 <= int(sub_response.get('status', 0)) < 300:
+                        results[int(sub_response['id'])] = True
+
+        except Exception as e:
+            print(f"Error sending batched emails: {e}")
+
+        return results
+
     def _format_issues_text(self, issues: IssueCollection):
         """Format issues as plain text (fallback for email clients)."""
         if issues.is_empty():
             return ""
-        
-        text = f"Data Quality Alert Report\n"
-        text += f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-        text += f"Total Issues Found: {len(issues)}\n\n"
-        
+
+        parts = [
+            "Data Quality Alert Report\n"
+            f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+            f"Total Issues Found: {len(issues)}\n\n"
+        ]
+        append = parts.append
+
         # Group by check name using IssueCollection method
         issues_by_check = issues.group_by_check()
-        
+
         for check_name, check_issues in issues_by_check.items():
-            text += f"{check_name}:\n"
-            text += "-" * len(check_name) + "\n"
+            append(f"{check_name}:\n{'-' * len(check_name)}\n")
             for issue in check_issues:
-                text += f"  [{issue.severity.upper()}] {issue.message}\n"
                 if issue.details:
-                    text += f"    Details: {issue.details}\n"
-                text += "\n"
-        
-        return text
+                    append(f"  [{issue.severity.upper()}] {issue.message}\n"
+                           f"    Details: {issue.details}\n\n")
+                else:
+                    append(f"  [{issue.severity.upper()}] {issue.message}\n\n")
+
+        return ''.join(parts)
 
@@ -1,10 +1,15 @@
 """Issue and IssueCollection classes for data quality checks."""
+from collections import Counter
 from typing import Optional, Dict, List
 
 
 class Issue:
     """Represents a single data quality issue."""
-    
+
+    # Fixed slots instead of a per-instance __dict__: smaller instances and
+    # faster attribute access in the grouping/formatting loops
+    __slots__ = ('check_name', 'severity', 'message', 'details', 'extra_data')
+
     VALID_SEVERITIES = {'low', 'medium', 'high'}
     
     def __init__(self, check_name: str, severity: str, message: str, 
@@ -50,6 +55,9 @@ class IssueCollection:
     def __init__(self):
         """Initialize an empty IssueCollection."""
         self.issues: List[Issue] = []
+        self._grouped: Optional[Dict[str, List[Issue]]] = None
+        # Maintained incrementally so severity counts never re-walk the list
+        self._by_severity: Counter = Counter()
     
     def add_issue(self, check_name: str, severity: str, message: str, 
                   details: Optional[str] = None, extra_data: Optional[Dict] = None) -> 'IssueCollection':
@@ -68,6 +76,8 @@ class IssueCollection:
         """
         issue = Issue(check_name, severity, message, details, extra_data)
         self.issues.append(issue)
+        self._by_severity[issue.severity] += 1
+        self._grouped = None
         return self
     
     def filter_by_severity(self, severity: str) -> 'IssueCollection':
@@ -82,21 +92,25 @@ class IssueCollection:
         """
         filtered = IssueCollection()
         filtered.issues = [issue for issue in self.issues if issue.severity == severity]
+        filtered._by_severity[severity] = len(filtered.issues)
         return filtered
     
     def group_by_check(self) -> Dict[str, List[Issue]]:
         """
         Group issues by check_name.
-        
+
+        The grouping is computed once and cached; adding issues invalidates
+        the cache.
+
         Returns:
             Dictionary mapping check_name to list of issues
         """
-        grouped = {}
-        for issue in self.issues:
-            if issue.check_name not in grouped:
-                grouped[issue.check_name] = []
-            grouped[issue.check_name].append(issue)
-        return grouped
+        if self._grouped is None:
+            grouped = {}
+            for issue in self.issues:
+                grouped.setdefault(issue.check_name, []).append(issue)
+            self._grouped = grouped
+        return self._grouped
     
     def count_by_severity(self) -> Dict[str, int]:
         """
@@ -106,8 +120,8 @@ class IssueCollection:
             Dictionary mapping severity to count, e.g. {'low': 0, 'medium': 0, 'high': 0}
         """
         counts = {'low': 0, 'medium': 0, 'high': 0}
-        for issue in self.issues:
-            counts[issue.severity] = counts.get(issue.severity, 0) + 1
+        # The histogram is maintained incrementally; no pass over the list
+        counts.update(self._by_severity)
         return counts
     
     def get_summary(self) -> Dict:
@@ -117,17 +131,37 @@ class IssueCollection:
         Returns:
             Dictionary with summary statistics
         """
+        grouped = self.group_by_check()
         return {
             'total_issues': len(self.issues),
             'by_severity': self.count_by_severity(),
-            'by_check': {name: len(issues) for name, issues in self.group_by_check().items()},
-            'unique_checks': len(self.group_by_check())
+            'by_check': {name: len(issues) for name, issues in grouped.items()},
+            'unique_checks': len(grouped)
         }
     
     def is_empty(self) -> bool:
         """Check if the collection is empty."""
         return len(self.issues) == 0
     
+    def extend_from(self, issues_iter) -> int:
+        """
+        Append issues from any iterable (e.g. a generator) of Issue objects.
+
+        Args:
+            issues_iter: Iterable of Issue objects
+
+        Returns:
+            int: Number of issues appended
+        """
+        before = len(self.issues)
+        append = self.issues.append
+        by_severity = self._by_severity
+        for issue in issues_iter:
+            append(issue)
+            by_severity[issue.severity] += 1
+        self._grouped = None
+        return len(self.issues) - before
+
     def extend(self, other: 'IssueCollection'):
         """
         Add all issues from another IssueCollection.
@@ -136,6 +170,8 @@ class IssueCollection:
             other: Another IssueCollection to merge
         """
         self.issues.extend(other.issues)
+        self._by_severity.update(other._by_severity)
+        self._grouped = None
     
     def __iter__(self):
         """Make the collection iterable."""
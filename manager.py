@@ -1,158 +1,329 @@
 """Manager script that discovers and executes all data quality check scripts."""
+import functools
 import os
-import argparse
+import logging
 import importlib
-import importlib.util
+import json
 import sys
 from pathlib import Path
-from email_reporter import EmailReporter
+from base_check import BaseCheck
 from issue import IssueCollection
+from runner import run_checks_parallel
 from config import CheckConfig
 
+logger = logging.getLogger('check_manager')
+
+
+def _validate_check_class(cls):
+    """
+    Return an error message if cls is not a usable check class, else None.
+
+    Catching malformed classes at discovery gives one clear warning up
+    front instead of the same failure repeating when every run is
+    attempted.
+    """
+    run = getattr(cls, 'run', None)
+    if not callable(run):
+        return f"{cls.__name__} has no callable run() method"
+    if getattr(run, '__isabstractmethod__', False):
+        return f"{cls.__name__} does not implement run()"
+    return None
+
+
+def _iter_subclasses(cls):
+    """Yield all (transitive) subclasses of cls."""
+    for subclass in cls.__subclasses__():
+        yield subclass
+        yield from _iter_subclasses(subclass)
+
+
+class _CheckEntry:
+    """A discovered check class whose module import is deferred to load()."""
+
+    __slots__ = ('module_name', 'file_path', 'check_name', 'name_lc',
+                 '_cls', '_instance')
+
+    def __init__(self, module_name, file_path, check_name, cls=None):
+        self.module_name = module_name
+        self.file_path = file_path
+        self.check_name = check_name
+        # Lowercased once at creation; name resolution and index rebuilds
+        # reuse it instead of re-allocating per lookup
+        self.name_lc = check_name.lower()
+        self._cls = cls
+        self._instance = None
+
+    def load(self):
+        """Get the check instance, importing its module on first use."""
+        if self._instance is None:
+            cls = self._cls
+            if cls is None:
+                module = importlib.import_module(self.module_name)
+                cls = getattr(module, self.check_name)
+                error = _validate_check_class(cls)
+                if error is not None:
+                    raise TypeError(error)
+                self._cls = cls
+            self._instance = cls()
+        return self._instance
+
 
 class CheckManager:
     """Manages discovery and execution of data quality check scripts."""
-    
+
+    # Fixed slots: no per-instance __dict__, faster attribute access in
+    # the discovery and filtering loops
+    __slots__ = ('checks_dir', 'issues', 'execution_mode', 'execution_info',
+                 '_discover_cache', '_by_class', '_by_file', '_filter_cache',
+                 '_disabled')
+
     def __init__(self, checks_dir='checks'):
         self.checks_dir = checks_dir
         self.issues = IssueCollection()
         self.execution_mode = None
         self.execution_info = None
+        # {path: ([st_mtime_ns, st_size], [check entries])} so repeated
+        # discovery runs in one process skip re-scanning unchanged modules
+        self._discover_cache = {}
+        # Lowercase name indexes for O(1) check-name resolution,
+        # rebuilt by discover_checks
+        self._by_class = {}
+        self._by_file = {}
+        # {(include, exclude): (predicate, info)} so repeated run_checks
+        # calls with the same arguments skip name resolution entirely
+        self._filter_cache = {}
+        # Disabled checks resolved once per manager (config is static
+        # per process); see _get_disabled_check_names
+        self._disabled = None
     
+    def _manifest_path(self):
+        """Path of the persisted discovery manifest."""
+        return Path(self.checks_dir) / '.discovery_cache.json'
+
+    def _load_manifest(self):
+        """Load the discovery manifest, tolerating a missing or corrupt file."""
+        try:
+            with open(self._manifest_path(), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self, manifest):
+        """Atomically persist the discovery manifest next to the checks."""
+        path = self._manifest_path()
+        tmp_path = path.with_suffix('.tmp')
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            # Discovery works without the manifest; it is only a cache
+            pass
+
     def discover_checks(self):
         """
         Discover all check scripts in the checks directory.
-        
+
+        A module is only imported when its file is new or changed since the
+        persisted manifest was written; on a manifest hit the class names
+        are taken from the manifest and the import is deferred until the
+        check entry is load()ed.
+
         Returns:
-            tuple: (list of check class instances, dict mapping file names to class names)
+            list: Discovered check entries (module, file, and class name per
+                check; see _CheckEntry)
         """
         checks = []
-        file_to_class_map = {}
         checks_path = Path(self.checks_dir)
-        
-        if not checks_path.exists():
-            print(f"Warning: Checks directory '{self.checks_dir}' not found")
-            return checks, file_to_class_map
-        
-        # Get all Python files in checks directory
-        for file_path in checks_path.glob('*.py'):
-            # Skip __init__.py
-            if file_path.name == '__init__.py':
-                continue
-            
+
+        # Single scandir pass over the checks directory; DirEntry caches
+        # the stat results from the directory read, so no extra stat
+        # syscall is needed per file. A missing directory surfaces as
+        # FileNotFoundError here, so no separate existence probe is needed
+        try:
+            with os.scandir(self.checks_dir) as dir_iter:
+                py_files = [dir_entry for dir_entry in dir_iter
+                            if (dir_entry.is_file() and
+                                dir_entry.name.endswith('.py') and
+                                dir_entry.name != '__init__.py')]
+        except FileNotFoundError:
+            logger.warning("Checks directory '%s' not found", self.checks_dir)
+            return checks
+
+        manifest = self._load_manifest()
+        new_manifest = {}
+
+        # Import through the package so sys.modules caches repeated imports
+        package = checks_path.name
+        package_parent = str(checks_path.resolve().parent)
+        if package_parent not in sys.path:
+            sys.path.insert(0, package_parent)
+
+        # Warm the page cache before the (serial) import loop:
+        # POSIX_FADV_WILLNEED starts asynchronous readahead, so on a cold
+        # cache the reads for all files are in flight before the first
+        # import blocks on disk; on a warm cache it is a no-op
+        if hasattr(os, 'posix_fadvise'):
+            for dir_entry in py_files:
+                try:
+                    fd = os.open(dir_entry.path, os.O_RDONLY)
+                    try:
+                        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+                    finally:
+                        os.close(fd)
+                except OSError:
+                    pass
+
+        for dir_entry in py_files:
             try:
-                # Import the module
-                module_name = file_path.stem
-                spec = importlib.util.spec_from_file_location(
-                    module_name,
-                    file_path
-                )
-                module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(module)
-                
-                # Find classes that inherit from BaseCheck
-                for attr_name in dir(module):
-                    attr = getattr(module, attr_name)
-                    if (isinstance(attr, type) and 
-                        attr_name != 'BaseCheck' and
-                        hasattr(attr, '__bases__')):
-                        # Check if it inherits from BaseCheck
-                        for base in attr.__bases__:
-                            if base.__name__ == 'BaseCheck':
-                                check_instance = attr()
-                                checks.append(check_instance)
-                                # Map file name to class name
-                                file_to_class_map[module_name] = check_instance.check_name
-                                print(f"Loaded check: {check_instance.check_name}")
-                                break
-            
+                module_name = dir_entry.name[:-3]
+                qualified_name = f'{package}.{module_name}'
+                path_key = dir_entry.path
+                stat = dir_entry.stat()
+                stat_key = [stat.st_mtime_ns, stat.st_size]
+
+                cached = self._discover_cache.get(path_key)
+                if cached is not None and cached[0] == stat_key:
+                    entries = cached[1]
+                else:
+                    recorded = manifest.get(path_key)
+                    if recorded is not None and recorded[0] == stat_key:
+                        # Unchanged since the manifest was written: take the
+                        # class names from it and skip the import entirely
+                        entries = [
+                            _CheckEntry(qualified_name, path_key, class_name)
+                            for class_name in recorded[1]
+                        ]
+                    else:
+                        # Import (or reload, if the file changed while this
+                        # process was running) through the package
+                        module = sys.modules.get(qualified_name)
+                        if module is not None:
+                            module = importlib.reload(module)
+                        else:
+                            module = importlib.import_module(qualified_name)
+
+                        # Ask BaseCheck for its subclasses instead of
+                        # scanning every module attribute; the identity
+                        # check drops classes left over from a reload
+                        entries = []
+                        for cls in _iter_subclasses(BaseCheck):
+                            if (cls.__module__ != module.__name__ or
+                                    getattr(module, cls.__name__, None) is not cls):
+                                continue
+                            error = _validate_check_class(cls)
+                            if error is not None:
+                                logger.warning("Skipping invalid check in %s: %s", dir_entry.name, error)
+                                continue
+                            entries.append(
+                                _CheckEntry(qualified_name, path_key, cls.__name__, cls=cls)
+                            )
+                    self._discover_cache[path_key] = (stat_key, entries)
+
+                new_manifest[path_key] = [
+                    stat_key, [entry.check_name for entry in entries]
+                ]
+
+                for entry in entries:
+                    checks.append(entry)
+                    logger.info("Loaded check: %s", entry.check_name)
+
             except Exception as e:
-                print(f"Error loading check from {file_path.name}: {e}")
-        
-        return checks, file_to_class_map
-    
-    def _resolve_check_name(self, check_name: str, all_checks: list, 
-                           file_to_class_map: dict) -> str:
+                logger.error("Error loading check from %s: %s", dir_entry.name, e)
+
+        # Entries for files that disappeared drop out automatically because
+        # the manifest is rebuilt from the current scan
+        if new_manifest != manifest:
+            self._save_manifest(new_manifest)
+
+        # Index names once so resolution is a hash lookup instead of a
+        # linear scan per requested name
+        self._by_class = {entry.name_lc: entry.check_name for entry in checks}
+        self._by_file = {entry.module_name.rsplit('.', 1)[-1].lower(): entry.check_name
+                         for entry in checks}
+
+        return checks
+
+    def _resolve_check_name(self, check_name: str) -> str:
         """
         Resolve a check name (class name or file name) to the actual class name.
-        
+
         Args:
             check_name: User-provided check name (class name or file name)
-            all_checks: List of all discovered check instances
-            file_to_class_map: Dictionary mapping file names to class names
-            
+
         Returns:
             Class name if found, None otherwise
         """
         check_name_lower = check_name.lower()
-        
-        for check in all_checks:
-            # Match by class name (case-insensitive)
-            if check.check_name.lower() == check_name_lower:
-                return check.check_name
-        
-        # Match by file name (case-insensitive)
-        for file_name, class_name in file_to_class_map.items():
-            if file_name.lower() == check_name_lower:
-                return class_name
-        
-        return None
+        return (self._by_class.get(check_name_lower) or
+                self._by_file.get(check_name_lower))
     
-    def _get_disabled_check_names(self, all_checks: list, 
-                                  file_to_class_map: dict) -> set:
+    def _get_disabled_check_names(self) -> frozenset:
         """
         Resolve disabled check names from configuration to actual class names.
-        
-        Args:
-            all_checks: List of all discovered check instances
-            file_to_class_map: Dictionary mapping file names to class names
-            
+
+        Resolved once per manager and frozen; the disabled configuration is
+        static for the process.
+
         Returns:
-            set: Set of disabled check class names
+            frozenset: Disabled check class names
         """
-        disabled_config = CheckConfig.get_disabled_checks()
-        if not disabled_config:
-            return set()
-        
+        if self._disabled is not None:
+            return self._disabled
+
         disabled_class_names = set()
-        for disabled_name in disabled_config:
-            resolved = self._resolve_check_name(disabled_name, all_checks, file_to_class_map)
+        for disabled_name in CheckConfig.get_disabled_checks():
+            resolved = self._resolve_check_name(disabled_name)
             if resolved:
                 disabled_class_names.add(resolved)
-        
-        return disabled_class_names
+
+        self._disabled = frozenset(disabled_class_names)
+        return self._disabled
     
-    def filter_checks(self, all_checks: list, file_to_class_map: dict,
+    def filter_checks(self, all_checks: list,
                      include_names: list = None, exclude_names: list = None) -> tuple:
         """
         Filter checks based on include/exclude criteria and disabled checks configuration.
-        
+
         Args:
-            all_checks: List of all discovered check instances
-            file_to_class_map: Dictionary mapping file names to class names
+            all_checks: List of all discovered check entries
             include_names: List of check names to include (if provided, only these run)
             exclude_names: List of check names to exclude
-            
+
         Returns:
             Tuple of (filtered_checks, execution_info_string)
         """
         if include_names and exclude_names:
             raise ValueError("Cannot use both --checks and --exclude at the same time")
-        
+
+        # Reuse the compiled name predicate when the same arguments repeat
+        # (daemon mode); resolution and its warnings ran on the first call
+        cache_key = (
+            tuple(include_names) if include_names else None,
+            tuple(exclude_names) if exclude_names else None,
+        )
+        cached = self._filter_cache.get(cache_key)
+        if cached is not None:
+            predicate, info = cached
+            return [check for check in all_checks if predicate(check.check_name)], info
+
         # Get disabled checks from configuration
-        disabled_class_names = self._get_disabled_check_names(all_checks, file_to_class_map)
+        disabled_class_names = self._get_disabled_check_names()
+
+        # Memoize resolution for the duration of this call; user-supplied
+        # names can repeat and the cache is dropped on return
+        resolve = functools.lru_cache(maxsize=None)(self._resolve_check_name)
         
         # Track disabled checks that were requested via --checks
         requested_disabled = []
         
         if include_names:
             # Include mode: only run specified checks
-            filtered = []
             resolved_names = []
             not_found = []
-            
+
             for name in include_names:
-                resolved = self._resolve_check_name(name, all_checks, file_to_class_map)
+                resolved = resolve(name)
                 if resolved:
                     # Check if this check is disabled
                     if resolved in disabled_class_names:
@@ -163,16 +334,15 @@ class CheckManager:
                     not_found.append(name)
             
             if not_found:
-                print(f"Warning: Could not find checks: {', '.join(not_found)}")
+                logger.warning("Could not find checks: %s", ', '.join(not_found))
             
             if requested_disabled:
                 formatted_disabled = ', '.join([self._format_check_name(name) for name in requested_disabled])
-                print(f"Warning: The following checks are disabled and will be skipped: {formatted_disabled}")
-            
-            for check in all_checks:
-                if check.check_name in resolved_names:
-                    filtered.append(check)
+                logger.warning("The following checks are disabled and will be skipped: %s", formatted_disabled)
             
+            selected = frozenset(resolved_names)
+            filtered = [check for check in all_checks if check.check_name in selected]
+
             if not filtered:
                 if requested_disabled:
                     return [], f"No valid checks found from: {', '.join(include_names)} (requested checks are disabled)"
@@ -183,28 +353,27 @@ class CheckManager:
             if requested_disabled:
                 formatted_disabled = ', '.join([self._format_check_name(name) for name in requested_disabled])
                 info += f" (disabled checks skipped: {formatted_disabled})"
+            self._filter_cache[cache_key] = (selected.__contains__, info)
             return filtered, info
         
         elif exclude_names:
             # Exclude mode: run all except specified
-            filtered = []
             excluded_names = []
             not_found = []
-            
+
             for name in exclude_names:
-                resolved = self._resolve_check_name(name, all_checks, file_to_class_map)
+                resolved = resolve(name)
                 if resolved:
                     excluded_names.append(resolved)
                 else:
                     not_found.append(name)
-            
+
             if not_found:
-                print(f"Warning: Could not find checks to exclude: {', '.join(not_found)}")
-            
+                logger.warning("Could not find checks to exclude: %s", ', '.join(not_found))
+
             # Filter out both excluded and disabled checks
-            for check in all_checks:
-                if check.check_name not in excluded_names and check.check_name not in disabled_class_names:
-                    filtered.append(check)
+            skipped = frozenset(excluded_names) | disabled_class_names
+            filtered = [check for check in all_checks if check.check_name not in skipped]
             
             excluded_formatted = []
             if excluded_names:
@@ -217,95 +386,142 @@ class CheckManager:
                 info = f"All checks executed except: {', '.join(excluded_formatted)}"
             else:
                 info = "All checks executed"
-            
+
+            self._filter_cache[cache_key] = (
+                lambda name, _skipped=skipped: name not in _skipped, info
+            )
             return filtered, info
         
         else:
             # Default: run all checks except disabled ones
-            filtered = []
-            for check in all_checks:
-                if check.check_name not in disabled_class_names:
-                    filtered.append(check)
+            disabled_frozen = frozenset(disabled_class_names)
+            filtered = [check for check in all_checks
+                        if check.check_name not in disabled_frozen]
             
             if disabled_class_names:
                 formatted_disabled = ', '.join([self._format_check_name(name) for name in disabled_class_names])
                 info = f"All checks executed (disabled checks skipped: {formatted_disabled})"
             else:
                 info = "All checks executed"
-            
+
+            self._filter_cache[cache_key] = (
+                lambda name, _skipped=disabled_frozen: name not in _skipped, info
+            )
             return filtered, info
     
     def _format_check_name(self, check_name: str) -> str:
         """Format check name by inserting spaces before capital letters."""
-        import re
-        return re.sub(r'(?<!^)(?=[A-Z])', ' ', check_name)
+        # Imported lazily so --help and no-issue runs skip the reporter
+        # module; sys.modules makes repeat calls a dict lookup
+        from email_reporter import format_check_name
+        return format_check_name(check_name)
     
-    def run_checks(self, include_names: list = None, exclude_names: list = None):
+    def run_checks(self, include_names: list = None, exclude_names: list = None,
+                   fail_fast_ratio: float = 1 / 3, fail_fast_min: int = 6,
+                   parallelism: int = None):
         """
-        Run discovered checks and collect issues.
-        
+        Run discovered checks concurrently and collect issues.
+
+        Checks run on worker threads, so run() implementations must be
+        thread-safe (the stateless query-then-build pattern used by the
+        bundled checks is).
+
         Args:
             include_names: List of check names to run (include mode)
             exclude_names: List of check names to skip (exclude mode)
+            fail_fast_ratio: Abort when this fraction of completed checks
+                has failed (e.g. shared database down)
+            fail_fast_min: Minimum completed checks before fail-fast applies
+            parallelism: Maximum worker threads, capped at the connection
+                pool size (default: one per check within that cap)
         """
-        all_checks, file_to_class_map = self.discover_checks()
+        all_checks = self.discover_checks()
         
         if not all_checks:
-            print("No checks found to run")
+            logger.warning("No checks found to run")
             return
         
         # Filter checks based on include/exclude
         checks, self.execution_info = self.filter_checks(
-            all_checks, file_to_class_map, include_names, exclude_names
+            all_checks, include_names, exclude_names
         )
         
         if not checks:
-            print("No checks to run after filtering")
+            logger.warning("No checks to run after filtering")
             return
-        
-        print(f"\nRunning {len(checks)} check(s)...\n")
-        
-        for check in checks:
+
+        # Only the checks that survived filtering get imported/instantiated;
+        # a constructor failure is reported like a run failure
+        loaded = []
+        for entry in checks:
             try:
-                print(f"Running {check.check_name}...")
-                check_issues = check.run()
-                self.issues.extend(check_issues)
-                
-                if not check_issues.is_empty():
-                    print(f"  Found {len(check_issues)} issue(s)")
-                else:
-                    print(f"  No issues found")
-            
+                loaded.append(entry.load())
             except Exception as e:
-                print(f"  Error running {check.check_name}: {e}")
+                logger.error("  Error loading %s: %s", entry.check_name, e)
+                self.issues.add_issue(
+                    check_name=entry.check_name,
+                    severity='high',
+                    message='Error loading check',
+                    details=str(e)
+                )
+        checks = loaded
+
+        if not checks:
+            logger.info("\nTotal issues found: %d", len(self.issues))
+            return
+
+        logger.info("\nRunning %d check(s) concurrently...\n", len(checks))
+
+        run = 0
+        failed = 0
+        for check, check_issues, error in run_checks_parallel(checks, max_workers=parallelism):
+            run += 1
+            if error is not None:
+                failed += 1
+                logger.error("  Error running %s: %s", check.check_name, error)
                 self.issues.add_issue(
                     check_name=check.check_name,
                     severity='high',
                     message='Error executing check',
-                    details=str(e)
+                    details=str(error)
                 )
+            else:
+                count = self.issues.extend_from(check_issues)
+
+                if count:
+                    logger.info("%s: found %d issue(s)", check.check_name, count)
+                else:
+                    logger.info("%s: no issues found", check.check_name)
+
+            # Fail fast: if most checks are failing (e.g. a shared database
+            # is down), stop wasting time on the rest
+            if run >= fail_fast_min and failed >= run * fail_fast_ratio:
+                logger.warning("Aborting remaining checks: %d/%d failed", failed, run)
+                break
         
-        print(f"\nTotal issues found: {len(self.issues)}")
+        logger.info("\nTotal issues found: %d", len(self.issues))
     
     def send_report(self):
         """Send email report if issues were found."""
         if self.issues.is_empty():
-            print("\nNo issues found. No email will be sent.")
+            logger.info("\nNo issues found. No email will be sent.")
             return
         
-        print("\nSending email report...")
+        logger.info("\nSending email report...")
+        from email_reporter import EmailReporter
         reporter = EmailReporter()
         success = reporter.send_email(self.issues, execution_info=self.execution_info)
         
         if success:
-            print("Email sent successfully")
+            logger.info("Email sent successfully")
         else:
-            print("Failed to send email")
+            logger.error("Failed to send email")
 
 
 def main():
     """Main entry point."""
     # Parse command-line arguments
+    import argparse
     parser = argparse.ArgumentParser(
         description='Run data quality checks and send email alerts',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -331,9 +547,46 @@ Examples:
         metavar='CHECK',
         help='Run all checks except the specified ones (can use class name or file name)'
     )
-    
+    parser.add_argument(
+        '--parallelism',
+        type=int,
+        default=None,
+        metavar='N',
+        help='Maximum number of worker threads for running checks, '
+             'capped at the connection pool size (default: one per check)'
+    )
+    parser.add_argument(
+        '--serial',
+        action='store_true',
+        help='Run checks one at a time (equivalent to --parallelism 1; useful for debugging)'
+    )
+    parser.add_argument(
+        '--quiet',
+        action='store_true',
+        help='Only log warnings and errors'
+    )
+    parser.add_argument(
+        '--fail-fast-ratio',
+        type=float,
+        default=1 / 3,
+        metavar='RATIO',
+        help='Abort remaining checks when this fraction of completed checks has failed (default: 1/3)'
+    )
+    parser.add_argument(
+        '--fail-fast-min',
+        type=int,
+        default=6,
+        metavar='N',
+        help='Minimum completed checks before the fail-fast abort applies (default: 6)'
+    )
+
     args = parser.parse_args()
-    
+
+    logging.basicConfig(
+        level=logging.WARNING if args.quiet else logging.INFO,
+        format='%(message)s'
+    )
+
     # Add checks directory to path for imports
     checks_dir = Path(__file__).parent / 'checks'
     if str(checks_dir) not in sys.path:
@@ -342,7 +595,10 @@ Examples:
     manager = CheckManager()
     manager.run_checks(
         include_names=args.checks,
-        exclude_names=args.exclude
+        exclude_names=args.exclude,
+        fail_fast_ratio=args.fail_fast_ratio,
+        fail_fast_min=args.fail_fast_min,
+        parallelism=1 if args.serial else args.parallelism
     )
     manager.send_report()
 
@@ -0,0 +1,103 @@
+"""Concurrent execution of data quality checks using a thread pool."""
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from config import DatabaseConfig
+
+
+def _run_batch(checks, abort):
+    """
+    Run a batch of checks sequentially on shared per-database connections.
+
+    One pooled connection per database is acquired up front and injected
+    into each check's run(), so the batch reuses live connections instead
+    of cycling the pool once per check. The abort event is polled between
+    checks so an early consumer exit (e.g. fail-fast) stops the batch
+    instead of letting it run to completion.
+
+    Args:
+        checks: List of check instances assigned to this worker
+        abort: threading.Event set when remaining checks should be skipped
+
+    Returns:
+        list: One (check, issues, error) tuple per started check
+    """
+    connections = {}
+    results = []
+
+    for check in checks:
+        if abort.is_set():
+            break
+        try:
+            connection = connections.get(check.database)
+            if connection is None:
+                connection = connections[check.database] = check.get_connection()
+            results.append((check, check.run(connection), None))
+        except Exception as e:
+            results.append((check, None, e))
+
+    for connection in connections.values():
+        try:
+            if connection.is_connected():
+                connection.close()
+        except Exception:
+            pass
+
+    return results
+
+
+def run_checks_parallel(checks, max_workers=None):
+    """
+    Run checks concurrently and yield results as they complete.
+
+    The checks are independent I/O-bound SQL queries, so threads are enough:
+    mysql-connector releases the GIL while waiting on the socket. Checks are
+    split round-robin into several small batches per worker, and a batch
+    holds one connection per database for its duration. Results only stream
+    back as whole batches complete, so keeping batches small is what lets
+    an early consumer exit (fail-fast) cancel queued work and see results
+    promptly instead of waiting on a few long batches.
+
+    Args:
+        checks: List of check instances to run
+        max_workers: Maximum number of worker threads; always capped at
+            the connection pool size (defaults to one per check within
+            that cap)
+
+    Yields:
+        tuple: (check, issues, error) per completed check. On success, issues
+            is the check's IssueCollection and error is None; on failure,
+            issues is None and error is the raised exception.
+    """
+    if not checks:
+        return
+
+    # get_connection() raises PoolError immediately when the pool is
+    # exhausted rather than blocking, so workers must never outnumber the
+    # connections available per database — explicit values included
+    if max_workers is None:
+        max_workers = len(checks)
+    max_workers = min(max(1, max_workers), DatabaseConfig.POOL_SIZE)
+
+    # Several batches per worker: enough to keep results streaming and give
+    # cancellation queued batches to drop, without cycling connections once
+    # per check
+    num_batches = min(len(checks), max_workers * 4)
+    batches = [checks[i::num_batches] for i in range(num_batches)]
+    batches = [batch for batch in batches if batch]
+
+    abort = threading.Event()
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as executor:
+        futures = [executor.submit(_run_batch, batch, abort) for batch in batches]
+
+        try:
+            for future in as_completed(futures):
+                for check, check_issues, error in future.result():
+                    yield check, check_issues, error
+        finally:
+            # If the consumer stops early (e.g. fail-fast abort), tell the
+            # in-flight batches to stop after their current check; every
+            # batch starts immediately, so cancellation alone cannot help
+            abort.set()
+            executor.shutdown(wait=False, cancel_futures=True)